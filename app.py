@@ -3,18 +3,25 @@ import pandas as pd
 import numpy as np
 import joblib
 import xgboost as xgb
-import matplotlib.pyplot as plt
 import os
-import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime
-import requests
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
 import json
-from typing import Dict, List, Any
+import re
+import hashlib
+from typing import Dict, Any, Tuple, Callable, Final
 import google.generativeai as genai
+import logging
 import warnings
 warnings.filterwarnings('ignore')
 
+log = logging.getLogger(__name__)
+
+DEBUG = os.environ.get("WELLNESS_DEBUG") == "1"
+
 # ------------------------
 # Streamlit Config
 # ------------------------
@@ -26,65 +33,29 @@ st.set_page_config(
 )
 
 # Professional medical CSS
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 3rem;
-        color: #2C3E50;
-        text-align: center;
-        margin-bottom: 1rem;
-        font-weight: bold;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
-    }
-    .sub-header {
-        font-size: 1.2rem;
-        color: #34495E;
-        text-align: center;
-        margin-bottom: 2rem;
-        font-style: italic;
-    }
-    .risk-card {
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        border-left: 5px solid;
-        transition: transform 0.2s;
-    }
-    .risk-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 12px rgba(0, 0, 0, 0.15);
-    }
-    .high-risk {
-        background: linear-gradient(135deg, #ffebee 0%, #ffcdd2 100%);
-        border-left-color: #f44336;
-    }
-    .moderate-risk {
-        background: linear-gradient(135deg, #fff3e0 0%, #ffe0b2 100%);
-        border-left-color: #ff9800;
-    }
-    .low-risk {
-        background: linear-gradient(135deg, #e8f5e8 0%, #c8e6c9 100%);
-        border-left-color: #4caf50;
-    }
-    .warning-box {
-        background-color: #fff3cd;
-        border: 1px solid #ffeaa7;
-        border-radius: 5px;
-        padding: 1rem;
-        margin: 1rem 0;
-        border-left: 4px solid #f39c12;
-    }
-    .metric-container {
-        background: white;
-        padding: 1rem;
-        border-radius: 8px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        text-align: center;
-        margin: 0.5rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def _css() -> str:
+    """Read the stylesheet once per process instead of rebuilding it on every rerun"""
+    return f"<style>\n{(Path(__file__).parent / 'static' / 'style.css').read_text()}</style>"
+
+st.markdown(_css(), unsafe_allow_html=True)
+
+# ------------------------
+# Shared lookup tables
+# ------------------------
+_COND_DISPLAY = {
+    'heart_disease': 'Heart Disease',
+    'diabetes': 'Diabetes',
+    'hypertension': 'Hypertension'
+}
+
+# Probability cut-offs between Low / Moderate / High risk
+_RISK_THRESHOLDS = (0.3, 0.6)
+_RISK_LEVELS = ('Low', 'Moderate', 'High')
+
+# Gauge bar colours, indexed by prob >= 0.5
+_GAUGE_BAR_COLOR = ("#4CAF50", "#FF9800")
+_MPL_BAR_COLOR = ("seagreen", "crimson")
 
 # ------------------------
 # Google Gemini Setup (From Chatbot Code)
@@ -104,18 +75,44 @@ chat_model = genai.GenerativeModel(
     )
 )
 
+@st.cache_data(max_entries=256, ttl=3600, show_spinner=False)
+def _cached_gemini_reply(message: str) -> str:
+    """Gemini reply for a question, reused for identical questions (e.g. the quick-question buttons)"""
+    return chat_model.generate_content(message).text
+
 def google_chatbot_query(message: str):
+    # Errors are handled outside the cached call so failures are retried, not cached
     try:
-        response = chat_model.generate_content(message)
-        return response.text
+        return _cached_gemini_reply(message.strip())
     except Exception as e:
         return f"⚠ Error: {e}"
 
 # ------------------------
 # Load Models & Data (From Chatbot Code)
 # ------------------------
-@st.cache_data
+XGB_MODEL_FILES = {
+    'heart_disease': 'models/xgb_heart.json',
+    'diabetes': 'models/xgb_diabetes.json',
+    'hypertension': 'models/xgb_hypertension.json'
+}
+
+def _model_versions() -> tuple:
+    """Mtimes of the XGBoost model files, used as the model and prediction cache key"""
+    versions = []
+    for path in XGB_MODEL_FILES.values():
+        try:
+            versions.append(os.path.getmtime(path))
+        except OSError:
+            versions.append(None)
+    return tuple(versions)
+
 def load_models():
+    return _load_models(_model_versions())
+
+# model_versions is only a cache key: a replaced model file changes it, so the
+# models are reloaded (and max_entries=1 drops the stale ones)
+@st.cache_resource(max_entries=1)
+def _load_models(model_versions: tuple):
     try:
         logreg = joblib.load("models/logreg_baseline.joblib")
     except:
@@ -123,24 +120,71 @@ def load_models():
     
     try:
         xgb_heart = xgb.XGBClassifier()
-        xgb_heart.load_model("models/xgb_heart.json")
+        xgb_heart.load_model(XGB_MODEL_FILES['heart_disease'])
     except:
         xgb_heart = None
     
     try:
         xgb_diabetes = xgb.XGBClassifier()
-        xgb_diabetes.load_model("models/xgb_diabetes.json")
+        xgb_diabetes.load_model(XGB_MODEL_FILES['diabetes'])
     except:
         xgb_diabetes = None
     
     try:
         xgb_hyper = xgb.XGBClassifier()
-        xgb_hyper.load_model("models/xgb_hypertension.json")
+        xgb_hyper.load_model(XGB_MODEL_FILES['hypertension'])
     except:
         xgb_hyper = None
     
     return logreg, xgb_heart, xgb_diabetes, xgb_hyper
 
+@st.cache_data(max_entries=512)
+def _predict(condition: str, feature_tuple: tuple, model_versions: tuple) -> float:
+    """Predicted probability for one encoded feature row, memoized on the inputs and model versions"""
+    _, xgb_heart, xgb_diabetes, xgb_hyper = _load_models(model_versions)
+    model = {'heart_disease': xgb_heart, 'diabetes': xgb_diabetes, 'hypertension': xgb_hyper}[condition]
+    # The only DataFrame built on the prediction path; encoders hand over plain values
+    row = np.fromiter(feature_tuple, dtype=np.float32, count=len(feature_tuple)).reshape(1, -1)
+    X = pd.DataFrame(row, columns=model.get_booster().feature_names)
+    return float(model.predict_proba(X)[0, 1])
+
+MODEL_FILES = {
+    'heart_disease': 'heart_disease_model.pkl',
+    'diabetes': 'diabetes_model.pkl',
+    'hypertension': 'hypertension_model.pkl'
+}
+
+SCALER_FILES = {
+    'heart_disease': 'heart_disease_scaler.pkl',
+    'diabetes': 'diabetes_scaler.pkl',
+    'hypertension': 'hypertension_scaler.pkl'
+}
+
+@st.cache_resource
+def _load_all_models():
+    """Load pickled models, scalers and metadata once per server process"""
+    bundle = {'models': {}, 'scalers': {}, 'feature_names': {}, 'perf': {}}
+
+    # (bundle section, condition) -> file; condition None means the whole section
+    paths = {('models', condition): path for condition, path in MODEL_FILES.items()}
+    paths.update({('scalers', condition): path for condition, path in SCALER_FILES.items()})
+    paths[('feature_names', None)] = 'feature_names.pkl'
+    paths[('perf', None)] = 'performance_metrics.pkl'
+    paths = {key: path for key, path in paths.items() if os.path.exists(path)}
+
+    # Overlap the file reads; unpickling numpy buffers releases the GIL
+    with ThreadPoolExecutor(max_workers=len(paths) or 1) as executor:
+        # mmap_mode shares the numpy buffers' pages between worker processes
+        loaded = dict(zip(paths, executor.map(partial(joblib.load, mmap_mode='r'), paths.values())))
+
+    for (section, condition), obj in loaded.items():
+        if condition is None:
+            bundle[section] = obj
+        else:
+            bundle[section][condition] = obj
+
+    return bundle
+
 @st.cache_data
 def load_median_values():
     try:
@@ -167,50 +211,108 @@ def load_median_values():
 # ------------------------
 # Input Encoding (Heart Model) - From Chatbot Code
 # ------------------------
+# Category -> one-hot columns, with the model's reference level as all zeros
+_CP_ONEHOT = {
+    "typical angina": (0, 0, 0), "atypical angina": (1, 0, 0),
+    "non-anginal pain": (0, 1, 0), "asymptomatic": (0, 0, 1)
+}
+_RESTECG_ONEHOT = {
+    "Normal": (0, 0), "ST-T wave abnormality": (1, 0), "Left ventricular hypertrophy": (0, 1)
+}
+_SLOPE_ONEHOT = {"Upsloping": (0, 0), "Flat": (1, 0), "Downsloping": (0, 1)}
+_THAL_ONEHOT = {"Fixed defect": (1, 0, 0), "Reversible defect": (0, 1, 0), "Normal": (0, 0, 1)}
+_YES_NO = {"Yes": 1, "No": 0}
+_SEX = {"Male": 1, "Female": 0}
+
 def encode_input(
     age: int, sex: str, cp: str, trestbps: int, chol: int,
     fbs: str, restecg: str, thalach: int, exang: str,
     oldpeak: float, slope: str, ca: int, thal: str
-) -> pd.DataFrame:
-    sex_val = 1 if sex == "Male" else 0
-    fbs_val = 1 if fbs == "Yes" else 0
-    exang_val = 1 if exang == "Yes" else 0
-    cp_code = {"typical angina": 0, "atypical angina": 1, "non-anginal pain": 2, "asymptomatic": 3}[cp]
-    if cp_code == 0: cp_vals = [0,0,0]
-    elif cp_code == 1: cp_vals = [1,0,0]
-    elif cp_code == 2: cp_vals = [0,1,0]
-    else: cp_vals = [0,0,1]
-    restecg_code = {"Normal":0,"ST-T wave abnormality":1,"Left ventricular hypertrophy":2}[restecg]
-    if restecg_code == 0: restecg_vals=[0,0]
-    elif restecg_code == 1: restecg_vals=[1,0]
-    else: restecg_vals=[0,1]
-    slope_code = {"Upsloping":0,"Flat":1,"Downsloping":2}[slope]
-    if slope_code==0: slope_vals=[0,0]
-    elif slope_code==1: slope_vals=[1,0]
-    else: slope_vals=[0,1]
-    thal_code = {"Fixed defect":1,"Reversible defect":2,"Normal":3}[thal]
-    if thal_code==0: thal_vals=[0,0,0]
-    elif thal_code==1: thal_vals=[1,0,0]
-    elif thal_code==2: thal_vals=[0,1,0]
-    else: thal_vals=[0,0,1]
-    feature_vector = [
-        age, sex_val, trestbps, chol, fbs_val, thalach, exang_val, oldpeak, ca,
-        *cp_vals, *restecg_vals, *slope_vals, *thal_vals
-    ]
-    
-    try:
-        _, xgb_heart, _, _ = load_models()
-        if xgb_heart:
-            feature_names = xgb_heart.get_booster().feature_names
-            X_new = pd.DataFrame([feature_vector], columns=feature_names)
-            return X_new
-    except:
-        pass
-    
-    # Fallback with generic feature names
-    feature_names = [f'feature_{i}' for i in range(len(feature_vector))]
-    X_new = pd.DataFrame([feature_vector], columns=feature_names)
-    return X_new
+) -> np.ndarray:
+    """Encode the heart sidebar values as a (1, 19) float32 row in the model's column order"""
+    sex_val = _SEX[sex]
+    fbs_val = _YES_NO[fbs]
+    exang_val = _YES_NO[exang]
+    cp_vals = _CP_ONEHOT[cp]
+    restecg_vals = _RESTECG_ONEHOT[restecg]
+    slope_vals = _SLOPE_ONEHOT[slope]
+    thal_vals = _THAL_ONEHOT[thal]
+    # Preallocated float32 row: no list building or np.array dtype inference
+    feature_vector = np.empty((1, 19), dtype=np.float32)
+    feature_vector[0, :9] = (age, sex_val, trestbps, chol, fbs_val, thalach, exang_val, oldpeak, ca)
+    feature_vector[0, 9:12] = cp_vals
+    feature_vector[0, 12:14] = restecg_vals
+    feature_vector[0, 14:16] = slope_vals
+    feature_vector[0, 16:19] = thal_vals
+    return feature_vector
+
+# Hypertension model columns and defaults, built once; only the sidebar
+# values change per assessment
+HYPERTENSION_FEATURES = (
+    'Age', 'BMI', 'Cholesterol', 'Systolic_BP', 'Diastolic_BP',
+    'Alcohol_Intake', 'Stress_Level', 'Salt_Intake', 'Sleep_Duration', 'Heart_Rate',
+    'LDL', 'HDL', 'Triglycerides', 'Glucose', 'Country_Australia', 'Country_Brazil',
+    'Country_Canada', 'Country_China', 'Country_France', 'Country_Germany', 'Country_India',
+    'Country_Indonesia', 'Country_Italy', 'Country_Japan', 'Country_Mexico', 'Country_Russia',
+    'Country_Saudi Arabia', 'Country_South Africa', 'Country_South Korea', 'Country_Spain',
+    'Country_Turkey', 'Country_UK', 'Country_USA', 'Smoking_Status_Former', 'Smoking_Status_Never',
+    'Physical_Activity_Level_Low', 'Physical_Activity_Level_Moderate', 'Family_History_Yes',
+    'Diabetes_Yes', 'Gender_Male', 'Education_Level_Secondary', 'Education_Level_Tertiary',
+    'Employment_Status_Retired', 'Employment_Status_Unemployed'
+)
+
+_HYPERTENSION_DEFAULTS = {
+    'Cholesterol': 0, 'Alcohol_Intake': 0, 'Stress_Level': 0, 'Salt_Intake': 0,
+    'Sleep_Duration': 0, 'Heart_Rate': 0, 'LDL': 0, 'HDL': 0, 'Triglycerides': 0,
+    'Glucose': 0, 'Country_Australia': 0, 'Country_Brazil': 0, 'Country_Canada': 0,
+    'Country_China': 0, 'Country_France': 0, 'Country_Germany': 0, 'Country_India': 0,
+    'Country_Indonesia': 0, 'Country_Italy': 0, 'Country_Japan': 0, 'Country_Mexico': 0,
+    'Country_Russia': 0, 'Country_Saudi Arabia': 0, 'Country_South Africa': 0,
+    'Country_South Korea': 0, 'Country_Spain': 0, 'Country_Turkey': 0, 'Country_UK': 0,
+    'Country_USA': 0, 'Smoking_Status_Former': 0, 'Smoking_Status_Never': 1,
+    'Physical_Activity_Level_Low': 0, 'Physical_Activity_Level_Moderate': 1,
+    'Family_History_Yes': 0, 'Diabetes_Yes': 0, 'Gender_Male': 1,
+    'Education_Level_Secondary': 0, 'Education_Level_Tertiary': 0,
+    'Employment_Status_Retired': 0, 'Employment_Status_Unemployed': 0
+}
+
+def encode_diabetes_input(
+    pregnancies: int, glucose: int, blood_pressure: int, skin_thickness: int,
+    insulin: int, bmi: float, dpf: float, age: int
+) -> tuple:
+    _, _, xgb_diabetes, _ = load_models()
+    feature_names = xgb_diabetes.get_booster().feature_names
+    input_dict = {feat: 0 for feat in feature_names}
+    input_dict['Pregnancies'] = pregnancies
+    input_dict['Glucose'] = glucose
+    input_dict['BloodPressure'] = blood_pressure
+    input_dict['SkinThickness'] = skin_thickness
+    input_dict['Insulin'] = insulin
+    input_dict['BMI'] = bmi
+    input_dict['DiabetesPedigreeFunction'] = dpf
+    input_dict['Age'] = age
+    return tuple(input_dict[feat] for feat in feature_names)
+
+def encode_hypertension_input(systolic: int, diastolic: int, bmi: float, age: int) -> tuple:
+    input_dict = {
+        **_HYPERTENSION_DEFAULTS,
+        'Age': age, 'BMI': bmi, 'Systolic_BP': systolic, 'Diastolic_BP': diastolic
+    }
+    return tuple(input_dict[feat] for feat in HYPERTENSION_FEATURES)
+
+def _inputs_key(payload: Any) -> str:
+    """Stable digest of JSON-serialisable inputs"""
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+def cached_risk(condition: str, inputs: tuple, build: Callable[..., tuple]) -> float:
+    """Predicted risk for the sidebar inputs, kept in session_state until the inputs or model change"""
+    model_versions = _model_versions()
+    key = _inputs_key([condition, inputs, model_versions])
+    if st.session_state.get(f"_pred_key_{condition}") != key:
+        st.session_state[f"_pred_{condition}"] = _predict(condition, build(*inputs), model_versions)
+        st.session_state[f"_pred_key_{condition}"] = key
+    return st.session_state[f"_pred_{condition}"]
 
 # ------------------------
 # Alert Functions (Placeholders)
@@ -225,81 +327,186 @@ def check_early_warning_heart(raw_feats):
         warnings.append("⚠️ Very high cholesterol detected")
     return warnings
 
+_PREVENTIVE_TIPS = {
+    "Diabetes": (
+        "Maintain healthy weight",
+        "Exercise regularly (30 min/day)",
+        "Eat balanced diet with low sugar",
+        "Monitor blood glucose regularly",
+        "Get regular health checkups"
+    ),
+    "Hypertension": (
+        "Reduce sodium intake",
+        "Exercise regularly",
+        "Maintain healthy weight",
+        "Limit alcohol consumption",
+        "Manage stress effectively"
+    )
+}
+
 def preventive_tips_disease(disease):
-    tips = {
-        "Diabetes": [
-            "Maintain healthy weight",
-            "Exercise regularly (30 min/day)",
-            "Eat balanced diet with low sugar",
-            "Monitor blood glucose regularly",
-            "Get regular health checkups"
-        ],
-        "Hypertension": [
-            "Reduce sodium intake",
-            "Exercise regularly",
-            "Maintain healthy weight",
-            "Limit alcohol consumption",
-            "Manage stress effectively"
-        ]
-    }
-    return tips.get(disease, ["Consult with healthcare provider"])
+    return _PREVENTIVE_TIPS.get(disease, ("Consult with healthcare provider",))
+
+@st.cache_resource(max_entries=128, show_spinner=False)
+def _cached_gauge(probability: float, title: str, color: str):
+    """Gauge figure shared across sessions and reruns for identical inputs; treat as read-only"""
+    import plotly.graph_objects as go
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=probability * 100,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': title},
+        delta={'reference': 30},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': color},
+            'steps': [
+                {'range': [0, 30], 'color': "lightgray"},
+                {'range': [30, 60], 'color': "yellow"},
+                {'range': [60, 100], 'color': "red"}
+            ]
+        }
+    ))
+    fig.update_layout(height=300)
+    return fig
+
+def create_risk_gauge(probability: float, title: str, color: str):
+    """Risk gauge for st.plotly_chart; probability is rounded to 0.1% to raise cache hits"""
+    return _cached_gauge(round(probability, 3), title, color)
 
 # ------------------------
 # Enhanced Wellness Assistant Class (From App-7)
 # ------------------------
+_MEDICAL_KNOWLEDGE = {
+    'heart_disease': {
+        'risk_factors': (
+            'Age over 55', 'High blood pressure', 'High cholesterol',
+            'Smoking', 'Diabetes', 'Family history', 'Obesity', 'Physical inactivity'
+        ),
+        'prevention': (
+            'Regular exercise (150 min/week moderate activity)',
+            'Heart-healthy diet (Mediterranean, DASH)',
+            'Maintain healthy weight (BMI 18.5-24.9)',
+            'Don\'t smoke or quit smoking',
+            'Manage stress through relaxation techniques',
+            'Get adequate sleep (7-9 hours)',
+            'Regular health checkups'
+        ),
+        'symptoms': (
+            'Chest pain or discomfort', 'Shortness of breath',
+            'Pain in arms, back, neck, jaw', 'Nausea', 'Cold sweat'
+        )
+    },
+    'diabetes': {
+        'risk_factors': (
+            'Age over 45', 'Overweight (BMI > 25)', 'Family history',
+            'Physical inactivity', 'High blood pressure', 'Abnormal cholesterol'
+        ),
+        'prevention': (
+            'Maintain healthy weight',
+            'Be physically active (30 min most days)',
+            'Eat healthy foods (whole grains, vegetables)',
+            'Limit refined carbs and sugary drinks',
+            'Regular health screenings'
+        ),
+        'symptoms': (
+            'Increased thirst and urination', 'Unexplained weight loss',
+            'Fatigue', 'Blurred vision', 'Slow-healing wounds'
+        )
+    },
+    'hypertension': {
+        'risk_factors': (
+            'Age', 'Family history', 'Obesity', 'Physical inactivity',
+            'High salt diet', 'Alcohol consumption', 'Stress', 'Smoking'
+        ),
+        'prevention': (
+            'Maintain healthy weight',
+            'Regular physical activity',
+            'Limit sodium intake (<2,300mg/day)',
+            'Eat potassium-rich foods',
+            'Limit alcohol consumption',
+            'Manage stress',
+            'Don\'t smoke'
+        ),
+        'symptoms': (
+            'Often no symptoms (silent killer)',
+            'Severe headache', 'Chest pain', 'Difficulty breathing',
+            'Vision problems', 'Blood in urine'
+        )
+    }
+}
+
+# (condition, risk level) -> recommendations
+_RECOMMENDATIONS = {
+    ('heart_disease', 'High'): (
+        "🚨 Consult a cardiologist immediately for comprehensive evaluation",
+        "🥗 Adopt Mediterranean diet: fish 2x/week, olive oil, nuts, vegetables",
+        "💊 Take prescribed medications exactly as directed",
+        "🚶‍♂️ Start with 10-15 min daily walks, gradually increase",
+        "🚭 Stop smoking completely - use nicotine replacement if needed",
+        "📊 Monitor blood pressure daily at same time",
+        "😴 Maintain 7-9 hours sleep with consistent schedule"
+    ),
+    ('heart_disease', 'Moderate'): (
+        "👨‍⚕️ Schedule regular checkups with your doctor every 3-6 months",
+        "🥗 Increase fruits and vegetables to 5-9 servings daily",
+        "🏃‍♂️ Aim for 150 minutes moderate exercise weekly",
+        "⚖️ Maintain healthy weight (BMI 18.5-24.9)",
+        "🧘‍♀️ Practice stress management: meditation, yoga, deep breathing"
+    ),
+    ('heart_disease', 'Low'): (
+        "✅ Continue healthy lifestyle habits",
+        "🔄 Annual health screenings and checkups",
+        "💪 Maintain regular physical activity",
+        "🥗 Keep eating balanced, nutritious diet"
+    )
+}
+
+class _ConstProbModel:
+    """Stand-in classifier for demo mode: uninformative 50/50 probabilities"""
+    def predict_proba(self, X):
+        return np.tile([0.5, 0.5], (X.shape[0], 1))
+
+class _IdentityScaler:
+    """Stand-in scaler for demo mode"""
+    def transform(self, X):
+        return X
+
 class WellnessAssistant:
     def __init__(self):
         self.models = {}
         self.scalers = {}
         self.feature_names = {}
         self.performance_metrics = {}
+        self.load_status = {'demo': False, 'error': None}
         self.load_models()
         self.setup_chatbot()
 
     def load_models(self):
         """Load trained models and components"""
         try:
-            model_files = {
-                'heart_disease': 'heart_disease_model.pkl',
-                'diabetes': 'diabetes_model.pkl',
-                'hypertension': 'hypertension_model.pkl'
-            }
-            
-            scaler_files = {
-                'heart_disease': 'heart_disease_scaler.pkl',
-                'diabetes': 'diabetes_scaler.pkl',
-                'hypertension': 'hypertension_scaler.pkl'
-            }
-            
-            # Load models
-            for condition, file_path in model_files.items():
-                if os.path.exists(file_path):
-                    self.models[condition] = joblib.load(file_path)
-
-            # Load scalers
-            for condition, file_path in scaler_files.items():
-                if os.path.exists(file_path):
-                    self.scalers[condition] = joblib.load(file_path)
-
-            # Load feature names and performance metrics
-            if os.path.exists('feature_names.pkl'):
-                self.feature_names = joblib.load('feature_names.pkl')
-
-            if os.path.exists('performance_metrics.pkl'):
-                self.performance_metrics = joblib.load('performance_metrics.pkl')
+            # Cached per process; copy the top-level dicts so demo fallbacks
+            # never write into the shared bundle
+            bundle = _load_all_models()
+            self.models = dict(bundle['models'])
+            self.scalers = dict(bundle['scalers'])
+            self.feature_names = bundle['feature_names']
+            self.performance_metrics = bundle['perf']
 
             if not self.models:
+                log.info("No trained models found, using demo models")
                 self.create_demo_models()
+            else:
+                log.info("Loaded models: %s", ", ".join(self.models))
 
         except Exception as e:
-            st.error(f"Error loading models: {str(e)}")
+            log.exception("Error loading models")
+            self.load_status['error'] = str(e)
             self.create_demo_models()
 
     def create_demo_models(self):
         """Create demo models for testing"""
-        from sklearn.ensemble import RandomForestClassifier
-        from sklearn.preprocessing import StandardScaler
-        
+        self.load_status['demo'] = True
         # Demo performance metrics
         self.performance_metrics = {
             'heart_disease': {'accuracy': 0.87, 'auc': 0.92, 'model_name': 'XGBoost'},
@@ -307,112 +514,111 @@ class WellnessAssistant:
             'hypertension': {'accuracy': 0.83, 'auc': 0.88, 'model_name': 'Logistic Regression'}
         }
         
-        # Create demo models
-        for condition in ['heart_disease', 'diabetes', 'hypertension']:
-            n_features = {'heart_disease': 14, 'diabetes': 10, 'hypertension': 13}[condition]
-            
-            X_demo = np.random.rand(100, n_features)
-            y_demo = np.random.randint(0, 2, 100)
-            
-            model = RandomForestClassifier(n_estimators=10, random_state=42)
-            model.fit(X_demo, y_demo)
-            self.models[condition] = model
-            
-            scaler = StandardScaler()
-            scaler.fit(X_demo)
-            self.scalers[condition] = scaler
+        # Create demo models (no training: a random-data fit carries no signal anyway)
+        for condition in _COND_DISPLAY:
+            self.models[condition] = _ConstProbModel()
+            self.scalers[condition] = _IdentityScaler()
 
     def setup_chatbot(self):
         """Setup AI chatbot knowledge base"""
-        self.medical_knowledge = {
-            'heart_disease': {
-                'risk_factors': [
-                    'Age over 55', 'High blood pressure', 'High cholesterol',
-                    'Smoking', 'Diabetes', 'Family history', 'Obesity', 'Physical inactivity'
-                ],
-                'prevention': [
-                    'Regular exercise (150 min/week moderate activity)',
-                    'Heart-healthy diet (Mediterranean, DASH)',
-                    'Maintain healthy weight (BMI 18.5-24.9)',
-                    'Don\'t smoke or quit smoking',
-                    'Manage stress through relaxation techniques',
-                    'Get adequate sleep (7-9 hours)',
-                    'Regular health checkups'
-                ],
-                'symptoms': [
-                    'Chest pain or discomfort', 'Shortness of breath',
-                    'Pain in arms, back, neck, jaw', 'Nausea', 'Cold sweat'
-                ]
-            },
-            'diabetes': {
-                'risk_factors': [
-                    'Age over 45', 'Overweight (BMI > 25)', 'Family history',
-                    'Physical inactivity', 'High blood pressure', 'Abnormal cholesterol'
-                ],
-                'prevention': [
-                    'Maintain healthy weight',
-                    'Be physically active (30 min most days)',
-                    'Eat healthy foods (whole grains, vegetables)',
-                    'Limit refined carbs and sugary drinks',
-                    'Regular health screenings'
-                ],
-                'symptoms': [
-                    'Increased thirst and urination', 'Unexplained weight loss',
-                    'Fatigue', 'Blurred vision', 'Slow-healing wounds'
-                ]
-            },
-            'hypertension': {
-                'risk_factors': [
-                    'Age', 'Family history', 'Obesity', 'Physical inactivity',
-                    'High salt diet', 'Alcohol consumption', 'Stress', 'Smoking'
-                ],
-                'prevention': [
-                    'Maintain healthy weight',
-                    'Regular physical activity',
-                    'Limit sodium intake (<2,300mg/day)',
-                    'Eat potassium-rich foods',
-                    'Limit alcohol consumption',
-                    'Manage stress',
-                    'Don\'t smoke'
-                ],
-                'symptoms': [
-                    'Often no symptoms (silent killer)',
-                    'Severe headache', 'Chest pain', 'Difficulty breathing',
-                    'Vision problems', 'Blood in urine'
-                ]
-            }
-        }
+        self.medical_knowledge = _MEDICAL_KNOWLEDGE
 
-    def get_recommendations(self, condition: str, risk_level: str, patient_data: Dict) -> List[str]:
+    def get_recommendations(self, condition: str, risk_level: str, patient_data: Dict) -> Tuple[str, ...]:
         """Get personalized recommendations"""
-        base_recommendations = {
-            'heart_disease': {
-                'High': [
-                    "🚨 Consult a cardiologist immediately for comprehensive evaluation",
-                    "🥗 Adopt Mediterranean diet: fish 2x/week, olive oil, nuts, vegetables",
-                    "💊 Take prescribed medications exactly as directed",
-                    "🚶‍♂️ Start with 10-15 min daily walks, gradually increase",
-                    "🚭 Stop smoking completely - use nicotine replacement if needed",
-                    "📊 Monitor blood pressure daily at same time",
-                    "😴 Maintain 7-9 hours sleep with consistent schedule"
-                ],
-                'Moderate': [
-                    "👨‍⚕️ Schedule regular checkups with your doctor every 3-6 months",
-                    "🥗 Increase fruits and vegetables to 5-9 servings daily",
-                    "🏃‍♂️ Aim for 150 minutes moderate exercise weekly",
-                    "⚖️ Maintain healthy weight (BMI 18.5-24.9)",
-                    "🧘‍♀️ Practice stress management: meditation, yoga, deep breathing"
-                ],
-                'Low': [
-                    "✅ Continue healthy lifestyle habits",
-                    "🔄 Annual health screenings and checkups",
-                    "💪 Maintain regular physical activity",
-                    "🥗 Keep eating balanced, nutritious diet"
-                ]
-            }
-        }
-        
-        return base_recommendations.get(condition, {}).get(risk_level, [])
+        return _RECOMMENDATIONS.get((condition, risk_level), ())
+
+@st.cache_resource
+def get_assistant() -> WellnessAssistant:
+    """Process-wide WellnessAssistant, so reruns don't rebuild it"""
+    return WellnessAssistant()
+
+# ------------------------
+# Static Page Content
+# ------------------------
+_DISCLAIMER_HTML: Final[str] = """
+<div class="warning-box">
+    <strong>⚕️ Medical Disclaimer:</strong> This AI tool provides educational information only and does not replace professional medical advice, diagnosis, or treatment. Always consult qualified healthcare providers for medical decisions.
+</div>
+"""
+
+_CHATBOT_BANNER_HTML: Final[str] = """
+<div style="background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%); 
+            border-radius: 15px; padding: 1.5rem; margin: 1rem 0; border: 2px solid #007bff;">
+    <h3>🧠 Powered by Google Gemini 2.0 Flash</h3>
+    <p>Ask me questions about Heart Disease, Diabetes, and Hypertension. I'm here to provide educational information and guidance!</p>
+</div>
+"""
+
+_WELCOME_MD: Final[str] = """
+## 🎯 How to Use This Application
+
+### 🫀 **Heart Disease Assessment**
+- Detailed clinical parameters including ECG, chest pain type, and cardiac markers
+- XGBoost model with high accuracy
+- Heart age calculation based on risk factors
+
+### 🩸 **Diabetes Risk Prediction**  
+- Comprehensive metabolic assessment
+- Includes pregnancy history, BMI, and glucose tolerance
+- Evidence-based lifestyle recommendations
+
+### 🩺 **Hypertension Evaluation**
+- Blood pressure analysis with demographic factors
+- Multi-country dataset for diverse populations
+- Personalized intervention strategies
+
+### 🤖 **AI Health Chatbot**
+- Google Gemini 2.0 Flash integration
+- Specialized in chronic disease education
+- 24/7 health guidance and support
+
+### 🚀 **Getting Started**
+1. Select a specific disease assessment from the sidebar
+2. Input your health parameters
+3. Review your personalized risk analysis
+4. Get evidence-based recommendations
+5. Chat with our AI assistant for questions
+
+### ⚠️ **Important Notes**
+- This tool is for educational purposes only
+- Always consult healthcare professionals for medical decisions
+- Regular health checkups are essential regardless of risk scores
+"""
+
+_METRIC_CARD: Final[str] = (
+    '<div class="metric-container" style="flex: 1 1 12rem;">'
+    '<h4>{name}</h4>'
+    '<p><strong>Model:</strong> {model_name}</p>'
+    '<p><strong>Accuracy:</strong> {accuracy:.1%}</p>'
+    '<p><strong>AUC:</strong> {auc:.3f}</p>'
+    '</div>'
+)
+
+# ------------------------
+# Chat Rendering
+# ------------------------
+# Messages kept per session (questions and replies count separately)
+CHAT_HISTORY_LIMIT = 10
+
+# Blank lines around the message end the HTML block, so the text between the
+# tags is still parsed as markdown. Only a "<" that could open a tag is escaped:
+# markdown doesn't decode entities inside code spans/blocks, so escaping every
+# "<" and "&" would show `a < b` as `a &lt; b`. A tag quoted inside a code span
+# still shows as `&lt;tag>`, the price of blocking raw HTML
+_HTML_TAG_START = re.compile(r'<(?=[A-Za-z/!?])')
+
+_CHAT_BUBBLE = {
+    "You": (
+        '<div style="background: #007bff; color: white; padding: 0.75rem; border-radius: 15px; '
+        'margin: 0.5rem 0; margin-left: 20%; text-align: right;">\n\n'
+        '**🧑 You:** {msg}\n\n</div>'
+    ),
+    "Bot": (
+        '<div style="background: #28a745; color: white; padding: 0.75rem; border-radius: 15px; '
+        'margin: 0.5rem 0; margin-right: 20%;">\n\n'
+        '**🤖 Gemini AI:**\n\n{msg}\n\n</div>'
+    )
+}
 
 # ------------------------
 # Main App
@@ -425,18 +631,18 @@ def main():
     st.markdown('<p class="sub-header">Complete Health Risk Assessment & AI Chatbot</p>', unsafe_allow_html=True)
     
     # Medical disclaimer
-    st.markdown("""
-    <div class="warning-box">
-        <strong>⚕️ Medical Disclaimer:</strong> This AI tool provides educational information only and does not replace professional medical advice, diagnosis, or treatment. Always consult qualified healthcare providers for medical decisions.
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_DISCLAIMER_HTML, unsafe_allow_html=True)
     
     # Load models
     logreg_model, xgb_heart, xgb_diabetes, xgb_hyper = load_models()
     medians = load_median_values()
     
     # Initialize wellness assistant
-    assistant = WellnessAssistant()
+    assistant = get_assistant()
+    if assistant.load_status['error']:
+        st.caption(f"⚠️ Error loading models ({assistant.load_status['error']}), running with demo models")
+    elif assistant.load_status['demo']:
+        st.caption("ℹ️ No trained models found, running with demo models")
     
     # Navigation
     page = st.sidebar.radio(
@@ -445,6 +651,14 @@ def main():
         key="main_nav"
     )
     
+    # Cache debugging: clears the gauge figures plus all st.cache_data entries (predictions,
+    # Gemini replies, medians) but not the model bundles or the assistant. Clearing is
+    # process-wide, so only offered when WELLNESS_DEBUG=1
+    if DEBUG and st.sidebar.checkbox("🛠️ Cache debug", key="cache_debug"):
+        if st.sidebar.button("🧹 Clear cached data", key="cache_clear"):
+            st.cache_data.clear()
+            _cached_gauge.clear()
+    
     # ---------------- Heart Disease (From Chatbot Code) ----------------
     if page == "Heart Disease":
         st.header("🫀 Heart Disease Risk Assessment")
@@ -493,14 +707,18 @@ def main():
                 st.success("✅ No immediate red-flag values detected.")
             
             try:
-                X_new = encode_input(age, sex, cp, trestbps, chol, fbs, restecg, thalach, exang, oldpeak, slope, ca, thal)
-                prob = xgb_heart.predict_proba(X_new)[0,1]
+                heart_inputs = (age, sex, cp, trestbps, chol, fbs, restecg, thalach, exang, oldpeak, slope, ca, thal)
+                prob = cached_risk(
+                    'heart_disease', heart_inputs,
+                    lambda *args: tuple(encode_input(*args).ravel().tolist())
+                )
                 
                 st.subheader(f"🎯 Predicted Risk of Heart Disease: {prob:.1%}")
                 
                 # Risk gauge
+                import matplotlib.pyplot as plt
                 fig, ax = plt.subplots(figsize=(6, 0.6))
-                bar_color = "crimson" if prob >= 0.5 else "seagreen"
+                bar_color = _MPL_BAR_COLOR[prob >= 0.5]
                 ax.barh(["Predicted Risk"], [prob], color=bar_color)
                 ax.set_xlim(0, 1)
                 ax.set_yticks([])
@@ -522,19 +740,19 @@ def main():
                         pass
                 
                 # Risk level and recommendations
-                if prob < 0.3:
-                    risk_level = "Low"
-                elif prob < 0.6:
-                    risk_level = "Moderate"
-                else:
-                    risk_level = "High"
+                risk_level = _RISK_LEVELS[bisect_right(_RISK_THRESHOLDS, prob)]
                 
                 st.subheader("💡 Personalized Recommendations")
-                recommendations = assistant.get_recommendations('heart_disease', risk_level, {})
-                for rec in recommendations:
-                    st.write(f"• {rec}")
+                # Rendered list follows the prediction digest, so it is rebuilt only when inputs change
+                recs_key = st.session_state.get("_pred_key_heart_disease")
+                if st.session_state.get("_recs_key_heart_disease") != recs_key:
+                    recommendations = assistant.get_recommendations('heart_disease', risk_level, {})
+                    st.session_state["_recs_heart_disease"] = "  \n".join(f"• {rec}" for rec in recommendations)
+                    st.session_state["_recs_key_heart_disease"] = recs_key
+                st.markdown(st.session_state["_recs_heart_disease"])
                 
             except Exception as e:
+                log.exception("Prediction failed")
                 st.error(f"❌ Prediction error: {str(e)}")
     
     # ---------------- Diabetes (From Chatbot Code) ----------------
@@ -556,46 +774,20 @@ def main():
                 return
             
             try:
-                expected_features_diab = xgb_diabetes.get_booster().feature_names
-                input_dict = {feat: 0 for feat in expected_features_diab}
-                input_dict['Pregnancies'] = Pregnancies
-                input_dict['Glucose'] = Glucose
-                input_dict['BloodPressure'] = BloodPressure
-                input_dict['SkinThickness'] = SkinThickness
-                input_dict['Insulin'] = Insulin
-                input_dict['BMI'] = BMI
-                input_dict['DiabetesPedigreeFunction'] = DiabetesPedigreeFunction
-                input_dict['Age'] = Age
-                X_diab = pd.DataFrame([input_dict], columns=expected_features_diab)
-                prob = xgb_diabetes.predict_proba(X_diab)[0,1]
+                diab_inputs = (Pregnancies, Glucose, BloodPressure, SkinThickness, Insulin, BMI, DiabetesPedigreeFunction, Age)
+                prob = cached_risk('diabetes', diab_inputs, encode_diabetes_input)
                 
                 st.subheader(f"🎯 Predicted Risk of Diabetes: {prob:.1%}")
                 
                 # Create risk gauge
-                fig = go.Figure(go.Indicator(
-                    mode="gauge+number+delta",
-                    value=prob * 100,
-                    domain={'x': [0, 1], 'y': [0, 1]},
-                    title={'text': "Diabetes Risk"},
-                    delta={'reference': 30},
-                    gauge={
-                        'axis': {'range': [None, 100]},
-                        'bar': {'color': "#FF9800" if prob >= 0.5 else "#4CAF50"},
-                        'steps': [
-                            {'range': [0, 30], 'color': "lightgray"},
-                            {'range': [30, 60], 'color': "yellow"},
-                            {'range': [60, 100], 'color': "red"}
-                        ]
-                    }
-                ))
-                fig.update_layout(height=300)
-                st.plotly_chart(fig, use_container_width=True)
+                fig = create_risk_gauge(prob, "Diabetes Risk", _GAUGE_BAR_COLOR[prob >= 0.5])
+                st.plotly_chart(fig, use_container_width=True, key="diabetes_gauge")
                 
                 st.subheader("💡 Lifestyle Tips")
-                for tip in preventive_tips_disease("Diabetes"):
-                    st.write("✅", tip)
+                st.markdown("  \n".join(f"✅ {tip}" for tip in preventive_tips_disease("Diabetes")))
                     
             except Exception as e:
+                log.exception("Prediction failed")
                 st.error(f"❌ Prediction error: {str(e)}")
     
     # ---------------- Hypertension (From Chatbot Code) ----------------
@@ -607,86 +799,37 @@ def main():
         bmi = st.sidebar.slider("BMI", 10.0, 50.0, 25.0, key="hyp_bmi")
         age_h = st.sidebar.slider("Age", 20, 80, 40, key="hyp_age")
         
-        expected_features_hyper = [
-            'Age', 'BMI', 'Cholesterol', 'Systolic_BP', 'Diastolic_BP',
-            'Alcohol_Intake', 'Stress_Level', 'Salt_Intake', 'Sleep_Duration', 'Heart_Rate',
-            'LDL', 'HDL', 'Triglycerides', 'Glucose', 'Country_Australia', 'Country_Brazil',
-            'Country_Canada', 'Country_China', 'Country_France', 'Country_Germany', 'Country_India',
-            'Country_Indonesia', 'Country_Italy', 'Country_Japan', 'Country_Mexico', 'Country_Russia',
-            'Country_Saudi Arabia', 'Country_South Africa', 'Country_South Korea', 'Country_Spain',
-            'Country_Turkey', 'Country_UK', 'Country_USA', 'Smoking_Status_Former', 'Smoking_Status_Never',
-            'Physical_Activity_Level_Low', 'Physical_Activity_Level_Moderate', 'Family_History_Yes',
-            'Diabetes_Yes', 'Gender_Male', 'Education_Level_Secondary', 'Education_Level_Tertiary',
-            'Employment_Status_Retired', 'Employment_Status_Unemployed'
-        ]
-        
         if st.button("🔍 Compute Hypertension Risk", key="hyp_compute", type="primary"):
             if xgb_hyper is None:
                 st.error("❌ Hypertension model not available")
                 return
             
             try:
-                input_dict = {
-                    'Age': age_h, 'BMI': bmi, 'Systolic_BP': systolic, 'Diastolic_BP': diastolic,
-                    'Cholesterol': 0, 'Alcohol_Intake': 0, 'Stress_Level': 0, 'Salt_Intake': 0,
-                    'Sleep_Duration': 0, 'Heart_Rate': 0, 'LDL': 0, 'HDL': 0, 'Triglycerides': 0,
-                    'Glucose': 0, 'Country_Australia': 0, 'Country_Brazil': 0, 'Country_Canada': 0,
-                    'Country_China': 0, 'Country_France': 0, 'Country_Germany': 0, 'Country_India': 0,
-                    'Country_Indonesia': 0, 'Country_Italy': 0, 'Country_Japan': 0, 'Country_Mexico': 0,
-                    'Country_Russia': 0, 'Country_Saudi Arabia': 0, 'Country_South Africa': 0,
-                    'Country_South Korea': 0, 'Country_Spain': 0, 'Country_Turkey': 0, 'Country_UK': 0,
-                    'Country_USA': 0, 'Smoking_Status_Former': 0, 'Smoking_Status_Never': 1,
-                    'Physical_Activity_Level_Low': 0, 'Physical_Activity_Level_Moderate': 1,
-                    'Family_History_Yes': 0, 'Diabetes_Yes': 0, 'Gender_Male': 1,
-                    'Education_Level_Secondary': 0, 'Education_Level_Tertiary': 0,
-                    'Employment_Status_Retired': 0, 'Employment_Status_Unemployed': 0
-                }
-                X_hyper = pd.DataFrame([input_dict], columns=expected_features_hyper)
-                prob = xgb_hyper.predict_proba(X_hyper)[0,1]
+                prob = cached_risk(
+                    'hypertension', (systolic, diastolic, bmi, age_h), encode_hypertension_input
+                )
                 
                 st.subheader(f"🎯 Predicted Risk of Hypertension: {prob:.1%}")
                 
                 # Create risk gauge
-                fig = go.Figure(go.Indicator(
-                    mode="gauge+number+delta",
-                    value=prob * 100,
-                    domain={'x': [0, 1], 'y': [0, 1]},
-                    title={'text': "Hypertension Risk"},
-                    delta={'reference': 30},
-                    gauge={
-                        'axis': {'range': [None, 100]},
-                        'bar': {'color': "#FF9800" if prob >= 0.5 else "#4CAF50"},
-                        'steps': [
-                            {'range': [0, 30], 'color': "lightgray"},
-                            {'range': [30, 60], 'color': "yellow"},
-                            {'range': [60, 100], 'color': "red"}
-                        ]
-                    }
-                ))
-                fig.update_layout(height=300)
-                st.plotly_chart(fig, use_container_width=True)
+                fig = create_risk_gauge(prob, "Hypertension Risk", _GAUGE_BAR_COLOR[prob >= 0.5])
+                st.plotly_chart(fig, use_container_width=True, key="hypertension_gauge")
                 
                 st.subheader("💡 Lifestyle Tips")
-                for tip in preventive_tips_disease("Hypertension"):
-                    st.write("✅", tip)
+                st.markdown("  \n".join(f"✅ {tip}" for tip in preventive_tips_disease("Hypertension")))
                     
             except Exception as e:
+                log.exception("Prediction failed")
                 st.error(f"❌ Prediction error: {str(e)}")
     
     # ---------------- Chatbot (From Chatbot Code) ----------------
     elif page == "💬 AI Chatbot":
         st.header("🤖 Health Assistant Chatbot (Google Gemini)")
         
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%); 
-                    border-radius: 15px; padding: 1.5rem; margin: 1rem 0; border: 2px solid #007bff;">
-            <h3>🧠 Powered by Google Gemini 2.0 Flash</h3>
-            <p>Ask me questions about Heart Disease, Diabetes, and Hypertension. I'm here to provide educational information and guidance!</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_CHATBOT_BANNER_HTML, unsafe_allow_html=True)
         
         if "chat_history" not in st.session_state:
-            st.session_state.chat_history = []
+            st.session_state.chat_history = deque(maxlen=CHAT_HISTORY_LIMIT)
         
         # Chat input
         user_input = st.text_input("💬 You:", key="chat_input", placeholder="Ask me about chronic diseases...")
@@ -696,7 +839,7 @@ def main():
             send_button = st.button("📤 Send", key="chat_send", type="primary")
         with col2:
             if st.button("🗑️ Clear Chat"):
-                st.session_state.chat_history = []
+                st.session_state.chat_history = deque(maxlen=CHAT_HISTORY_LIMIT)
                 st.rerun()
         
         if send_button and user_input:
@@ -708,21 +851,12 @@ def main():
         # Display chat history
         if st.session_state.chat_history:
             st.markdown("### 💭 Conversation History")
-            for role, msg in reversed(st.session_state.chat_history[-10:]):  # Show last 10 messages
-                if role == "You":
-                    st.markdown(f"""
-                    <div style="background: #007bff; color: white; padding: 0.75rem; border-radius: 15px; 
-                                margin: 0.5rem 0; margin-left: 20%; text-align: right;">
-                        <strong>🧑 You:</strong> {msg}
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div style="background: #28a745; color: white; padding: 0.75rem; border-radius: 15px; 
-                                margin: 0.5rem 0; margin-right: 20%;">
-                        <strong>🤖 Gemini AI:</strong> {msg}
-                    </div>
-                    """, unsafe_allow_html=True)
+            # One markdown element for the whole history; raw HTML tags in messages
+            # are neutralised since they are rendered with unsafe_allow_html
+            st.markdown("\n\n".join(
+                _CHAT_BUBBLE[role].format(msg=_HTML_TAG_START.sub('&lt;', msg))
+                for role, msg in reversed(st.session_state.chat_history)
+            ), unsafe_allow_html=True)
         else:
             st.info("👋 Start a conversation! Ask me anything about chronic diseases.")
             
@@ -750,59 +884,22 @@ def main():
         # Display model performance if available
         if assistant.performance_metrics:
             st.subheader("🎯 AI Model Performance")
-            cols = st.columns(3)
-            
-            conditions = ['heart_disease', 'diabetes', 'hypertension']
-            condition_names = ['Heart Disease', 'Diabetes', 'Hypertension']
             
-            for i, (condition, name) in enumerate(zip(conditions, condition_names)):
-                if condition in assistant.performance_metrics:
-                    metrics = assistant.performance_metrics[condition]
-                    with cols[i]:
-                        st.markdown(f"""
-                        <div class="metric-container">
-                            <h4>{name}</h4>
-                            <p><strong>Model:</strong> {metrics['model_name']}</p>
-                            <p><strong>Accuracy:</strong> {metrics['accuracy']:.1%}</p>
-                            <p><strong>AUC:</strong> {metrics['auc']:.3f}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-        
-        st.markdown("""
-        ## 🎯 How to Use This Application
-        
-        ### 🫀 **Heart Disease Assessment**
-        - Detailed clinical parameters including ECG, chest pain type, and cardiac markers
-        - XGBoost model with high accuracy
-        - Heart age calculation based on risk factors
-        
-        ### 🩸 **Diabetes Risk Prediction**  
-        - Comprehensive metabolic assessment
-        - Includes pregnancy history, BMI, and glucose tolerance
-        - Evidence-based lifestyle recommendations
-        
-        ### 🩺 **Hypertension Evaluation**
-        - Blood pressure analysis with demographic factors
-        - Multi-country dataset for diverse populations
-        - Personalized intervention strategies
-        
-        ### 🤖 **AI Health Chatbot**
-        - Google Gemini 2.0 Flash integration
-        - Specialized in chronic disease education
-        - 24/7 health guidance and support
-        
-        ### 🚀 **Getting Started**
-        1. Select a specific disease assessment from the sidebar
-        2. Input your health parameters
-        3. Review your personalized risk analysis
-        4. Get evidence-based recommendations
-        5. Chat with our AI assistant for questions
+            # All cards in one element instead of one markdown per column
+            metrics = assistant.performance_metrics
+            cards = "".join(
+                _METRIC_CARD.format(
+                    name=name,
+                    model_name=metrics[condition]['model_name'],
+                    accuracy=metrics[condition]['accuracy'],
+                    auc=metrics[condition]['auc']
+                )
+                for condition, name in _COND_DISPLAY.items()
+                if condition in metrics
+            )
+            st.markdown(f'<div style="display: flex; flex-wrap: wrap; gap: 12px;">{cards}</div>', unsafe_allow_html=True)
         
-        ### ⚠️ **Important Notes**
-        - This tool is for educational purposes only
-        - Always consult healthcare professionals for medical decisions
-        - Regular health checkups are essential regardless of risk scores
-        """)
+        st.markdown(_WELCOME_MD)
 
 # ------------------------
 # Run App